@@ -0,0 +1,213 @@
+import os
+import re
+import json
+import math
+import asyncio
+import base64
+import hashlib
+import binascii
+
+import pandas as pd
+from aiohttp import web
+
+import snapshot_store
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+CODE_CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'code.csv')
+
+# 필터 파라미터 -> (컬럼명, 비교 방향)
+FILTER_PARAMS = {
+    'min_deposit': ('보증금(만원)', 'min'),
+    'max_deposit': ('보증금(만원)', 'max'),
+    'min_rent': ('임대료(만원)', 'min'),
+    'max_rent': ('임대료(만원)', 'max'),
+    'min_period': ('계약기간', 'min'),
+    'max_period': ('계약기간', 'max'),
+}
+
+VERSION_PATTERN = re.compile(r'^v\d+$')
+
+# 자치구별 최근 버전 데이터프레임 (gu_code -> {version: DataFrame})
+_frames = {}
+
+
+def _load_frame(gu_code, version):
+    table = snapshot_store.open_snapshot(gu_code, version)
+    if table is None:
+        return None
+    return table.to_pandas()
+
+
+async def _get_frame(gu_code, version):
+    versions = _frames.setdefault(gu_code, {})
+    if version in versions:
+        return versions[version]
+
+    # 변환 작업이 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+    loop = asyncio.get_running_loop()
+    df = await loop.run_in_executor(None, _load_frame, gu_code, version)
+    if df is None:
+        return None
+
+    # 스냅샷 보관 개수만큼 최근 버전만 유지
+    versions[version] = df
+    for old_version in sorted(versions)[:-snapshot_store.KEEP_VERSIONS]:
+        del versions[old_version]
+    return df
+
+
+def _encode_cursor(gu_code, version, offset):
+    data = json.dumps({'g': gu_code, 'v': version, 'o': offset}).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def _decode_cursor(cursor, gu_code):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        cursor_gu_code, version, offset = data['g'], data['v'], data['o']
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise web.HTTPBadRequest(text="잘못된 cursor 값입니다.")
+
+    if (
+        cursor_gu_code != gu_code
+        or not isinstance(version, str)
+        or not VERSION_PATTERN.fullmatch(version)
+        or not isinstance(offset, int)
+        or isinstance(offset, bool)
+        or offset < 0
+    ):
+        raise web.HTTPBadRequest(text="잘못된 cursor 값입니다.")
+    return version, offset
+
+
+def _parse_number(query, name):
+    try:
+        value = float(query[name])
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{name} 값은 숫자여야 합니다.")
+    if not math.isfinite(value):
+        raise web.HTTPBadRequest(text=f"{name} 값은 유한한 숫자여야 합니다.")
+    return value
+
+
+def _parse_limit(query):
+    try:
+        limit = int(query.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise web.HTTPBadRequest(text="limit 값은 정수여야 합니다.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def apply_filters(df, bounds):
+    """filter_and_display_data 의 슬라이더와 동일한 범위 조건 적용"""
+    mask = pd.Series(True, index=df.index)
+    for name, value in bounds.items():
+        column, side = FILTER_PARAMS[name]
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df[column], errors='coerce')
+        mask &= values >= value if side == 'min' else values <= value
+    return df[mask]
+
+
+def _etag(gu_code, version, bounds, offset, limit):
+    """스냅샷 버전과 요청 조건으로 ETag 생성 (스냅샷이 불변이므로 응답도 동일)
+
+    압축 여부에 따라 응답 바이트가 달라지므로 약한(weak) ETag 사용
+    """
+    key = json.dumps([gu_code, version, sorted(bounds.items()), offset, limit])
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+
+def _etag_matches(etag, if_none_match):
+    """If-None-Match 헤더의 태그 목록과 약한 비교"""
+    tags = [tag.strip() for tag in if_none_match.split(',') if tag.strip()]
+    if '*' in tags:
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return any((tag[2:] if tag.startswith('W/') else tag) == opaque for tag in tags)
+
+
+async def list_districts(request):
+    """자치구 목록과 스냅샷 정보 조회"""
+    try:
+        codes_df = pd.read_csv(CODE_CSV_PATH)
+    except OSError as e:
+        raise web.HTTPInternalServerError(text=f"법정동 코드 파일 로드 중 오류 발생: {e}")
+    districts = []
+    for code, name in codes_df[['code', 'name']].values.tolist():
+        info = snapshot_store.latest_info(code)
+        districts.append({
+            'code': str(code),
+            'name': name,
+            'snapshot': info,
+        })
+    return web.json_response({'districts': districts})
+
+
+async def get_rents(request):
+    """자치구 임대차 데이터 조회 (필터, cursor 페이지네이션, ETag 지원)"""
+    gu_code = request.match_info['gu_code']
+    query = request.query
+
+    bounds = {
+        name: _parse_number(query, name)
+        for name in FILTER_PARAMS if name in query
+    }
+    limit = _parse_limit(query)
+
+    # cursor 가 있으면 해당 스냅샷 버전 기준으로 이어서 조회
+    if 'cursor' in query:
+        version, offset = _decode_cursor(query['cursor'], gu_code)
+    else:
+        info = snapshot_store.latest_info(gu_code)
+        if info is None:
+            raise web.HTTPNotFound(text="해당 자치구의 데이터 스냅샷이 없습니다.")
+        version, offset = info['version'], 0
+
+    if not snapshot_store.snapshot_exists(gu_code, version):
+        raise web.HTTPGone(text="스냅샷이 갱신되었습니다. cursor 없이 다시 조회하세요.")
+
+    etag = _etag(gu_code, version, bounds, offset, limit)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if _etag_matches(etag, request.headers.get('If-None-Match', '')):
+        raise web.HTTPNotModified(headers=headers)
+
+    df = await _get_frame(gu_code, version)
+    if df is None:
+        raise web.HTTPGone(text="스냅샷이 갱신되었습니다. cursor 없이 다시 조회하세요.")
+
+    filtered_df = apply_filters(df, bounds)
+    page_df = filtered_df.iloc[offset:offset + limit]
+    next_offset = offset + len(page_df)
+
+    body = {
+        'gu_code': gu_code,
+        'version': version,
+        'total_count': len(filtered_df),
+        'next_cursor': (
+            _encode_cursor(gu_code, version, next_offset)
+            if next_offset < len(filtered_df) else None
+        ),
+        'rows': json.loads(page_df.to_json(orient='records', force_ascii=False)),
+    }
+
+    response = web.json_response(
+        body,
+        dumps=lambda x: json.dumps(x, ensure_ascii=False),
+        headers=headers
+    )
+    response.enable_compression()
+    return response
+
+
+def create_app():
+    app = web.Application()
+    app.router.add_get('/districts', list_districts)
+    app.router.add_get('/rents/{gu_code}', get_rents)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(create_app(), port=int(os.getenv("API_PORT", "8080")))
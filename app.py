@@ -13,6 +13,7 @@ from streamlit_folium import folium_static
 from folium import plugins
 import folium
 from streamlit_folium import folium_static
+import snapshot_store
 
 # API 키 로드 함수
 def load_api_keys():
@@ -352,6 +353,44 @@ def filter_and_display_data(df, status_container=None, progress_bar=None):
     else:
         st.warning("조건에 맞는 데이터가 없습니다.")
 
+@st.cache_resource(max_entries=25)  # 자치구 수
+def get_snapshot_frame(gu_code, version, _table):
+    """스냅샷 버전별 데이터프레임 (세션 간 공유되므로 수정하지 말 것)"""
+    return _table.to_pandas()
+
+def build_district_data(gu_code, gu_name, chunk_size, status_container, progress_bar):
+    """자치구 데이터 수집, 전처리 및 위경도 조회 함수"""
+    # 캐시된 데이터 조회
+    df, error_msg = get_cached_data(gu_code, gu_name, chunk_size=chunk_size)
+    if error_msg:
+        return None, error_msg
+        
+    # 데이터 전처리
+    df = preprocess_data(df)
+    if df is None:
+        return None, "데이터 전처리 중 오류가 발생했습니다."
+    
+    # 주소 생성
+    df['주소'] = df.apply(lambda x: create_address(x, gu_name), axis=1)
+    
+    # 위치 정보 조회 진행률 표시
+    status_container.text("🌍 위치 정보를 조회중입니다...")
+    
+    coordinates = []
+    total_addresses = len(df['주소'])
+    
+    for idx, address in enumerate(df['주소']):
+        lng, lat = get_coordinates(address)
+        coordinates.append((lat, lng))
+        progress = (idx + 1) / total_addresses
+        progress_bar.progress(progress)
+        status_container.text(f"🌍 위치 정보를 조회중입니다... ({idx + 1}/{total_addresses})")
+    
+    df['위도'] = [coord[0] for coord in coordinates]
+    df['경도'] = [coord[1] for coord in coordinates]
+    
+    return df, None
+
 def main():
     st.title("서울시 임대차 정보 조회")
     
@@ -400,42 +439,29 @@ def main():
         
         # 데이터 조회 시작
         with st.spinner("🔍 데이터를 조회중입니다..."):
-            # 캐시된 데이터 조회
-            df, error_msg = get_cached_data(
-                selected_gu[0], 
-                selected_gu[1], 
-                chunk_size=chunk_size
+            progress_bar = progress_container.progress(0)
+
+            # 공유 스냅샷 조회 (없으면 한 프로세스만 수집 후 게시)
+            table, snapshot_info, error_msg = snapshot_store.get_or_build(
+                selected_gu[0],
+                selected_gu[1],
+                lambda: build_district_data(
+                    selected_gu[0],
+                    selected_gu[1],
+                    chunk_size,
+                    status_container,
+                    progress_bar
+                )
             )
-            
-            if error_msg:
+
+            if table is None:
                 st.error(error_msg)
                 return
-                
-            # 데이터 전처리
-            df = preprocess_data(df)
-            if df is None:
-                st.error("데이터 전처리 중 오류가 발생했습니다.")
-                return
-            
-            # 주소 생성
-            df['주소'] = df.apply(lambda x: create_address(x, selected_gu[1]), axis=1)
-            
-            # 위치 정보 조회 진행률 표시
-            status_container.text("🌍 위치 정보를 조회중입니다...")
-            progress_bar = progress_container.progress(0)
-            
-            coordinates = []
-            total_addresses = len(df['주소'])
-            
-            for idx, address in enumerate(df['주소']):
-                lng, lat = get_coordinates(address)
-                coordinates.append((lat, lng))
-                progress = (idx + 1) / total_addresses
-                progress_bar.progress(progress)
-                status_container.text(f"🌍 위치 정보를 조회중입니다... ({idx + 1}/{total_addresses})")
-            
-            df['위도'] = [coord[0] for coord in coordinates]
-            df['경도'] = [coord[1] for coord in coordinates]
+            if error_msg:
+                st.warning(f"데이터 갱신에 실패하여 이전 데이터를 표시합니다: {error_msg}")
+
+            # 같은 스냅샷 버전은 프로세스 내 모든 세션이 하나의 데이터프레임을 공유
+            df = get_snapshot_frame(selected_gu[0], snapshot_info['version'], table)
             
             # 데이터를 세션 상태에 저장
             st.session_state.full_data_df = df
@@ -443,7 +469,8 @@ def main():
             st.session_state.data_loaded = True
             
             # 완료 메시지 표시
-            status_container.text("✅ 데이터 수집이 완료되었습니다!")
+            created_at = datetime.fromtimestamp(snapshot_info['created_at'])
+            status_container.text(f"✅ 데이터 수집이 완료되었습니다! (기준 시각: {created_at.strftime('%Y-%m-%d %H:%M:%S')})")
             progress_bar.progress(1.0)
             
             # 기본 통계 정보 표시
@@ -467,8 +494,9 @@ def main():
             # 기간별 분석
             st.subheader("기간별 분석")
             if '계약일' in df.columns:
-                df['계약월'] = pd.to_datetime(df['계약일']).dt.strftime('%Y-%m')
-                monthly_stats = df.groupby('계약월').agg({
+                # 공유 데이터프레임이므로 컬럼을 추가하지 않고 그룹 키로만 사용
+                contract_month = pd.to_datetime(df['계약일']).dt.strftime('%Y-%m').rename('계약월')
+                monthly_stats = df.groupby(contract_month).agg({
                     '보증금(만원)': 'mean',
                     '임대료(만원)': 'mean',
                     '임대면적(㎡)': 'mean'
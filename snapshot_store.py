@@ -0,0 +1,230 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+import pyarrow as pa
+
+# 스냅샷 저장 경로 및 설정
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_TTL = 3600  # 1시간 (st.cache_data 와 동일)
+KEEP_VERSIONS = 3  # 다른 프로세스가 매핑 중일 수 있으므로 이전 버전 일부 유지
+
+# 프로세스별 열린 스냅샷 (자치구별 최신 버전만 보관: gu_code -> (version, Table))
+_opened_tables = {}
+
+
+def _gu_dir(gu_code):
+    return os.path.join(SNAPSHOT_DIR, str(gu_code))
+
+
+def _snapshot_path(gu_code, version):
+    return os.path.join(_gu_dir(gu_code), f"{version}.arrow")
+
+
+def _latest_path(gu_code):
+    return os.path.join(_gu_dir(gu_code), "LATEST")
+
+
+def _atomic_write(path, data):
+    """임시 파일에 기록 후 교체하여 다른 프로세스가 불완전한 파일을 보지 않도록 함"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def latest_info(gu_code):
+    """최신 스냅샷 정보(version, created_at, gu_name 등) 조회"""
+    try:
+        with open(_latest_path(gu_code), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(info, ttl=SNAPSHOT_TTL):
+    return info is not None and time.time() - info["created_at"] < ttl
+
+
+def snapshot_exists(gu_code, version):
+    return os.path.exists(_snapshot_path(gu_code, version))
+
+
+def open_snapshot(gu_code, version):
+    """스냅샷을 메모리 맵으로 열어 pyarrow Table 반환 (복사 없음)"""
+    gu_code = str(gu_code)
+    cached = _opened_tables.get(gu_code)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    path = _snapshot_path(gu_code, version)
+    if not os.path.exists(path):
+        return None
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+
+    # 더 새로운 버전일 때만 교체 (이전 버전의 매핑은 참조가 사라지면 해제됨)
+    if cached is None or version > cached[0]:
+        _opened_tables[gu_code] = (version, table)
+    return table
+
+
+def load_latest(gu_code, ttl=SNAPSHOT_TTL):
+    """유효한 최신 스냅샷이 있으면 (Table, info) 반환, 없으면 (None, None)"""
+    info = latest_info(gu_code)
+    if not is_fresh(info, ttl):
+        return None, None
+    table = open_snapshot(gu_code, info["version"])
+    if table is None:
+        return None, None
+    return table, info
+
+
+def publish_snapshot(gu_code, gu_name, df):
+    """전처리/위경도 조회가 끝난 데이터프레임을 새 버전으로 게시"""
+    os.makedirs(_gu_dir(gu_code), exist_ok=True)
+
+    # 숫자형이 아닌 컬럼은 API 원본 값(숫자/빈 문자열 혼재)일 수 있으므로 문자열로 통일
+    # (값이 모두 비어 있는 컬럼은 그대로 두어 null 컬럼으로 저장)
+    df = df.astype({
+        col: "string" for col in df.columns
+        if df[col].dtype == object
+        and pd.api.types.infer_dtype(df[col], skipna=True) != "empty"
+    })
+
+    version = f"v{time.time_ns()}"
+    info = {
+        "version": version,
+        "gu_code": str(gu_code),
+        "gu_name": gu_name,
+        "created_at": time.time(),
+        "rows": len(df),
+    }
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"snapshot": json.dumps(info, ensure_ascii=False).encode("utf-8"),
+    })
+
+    # 스냅샷 파일 기록 후 LATEST 포인터 교체
+    path = _snapshot_path(gu_code, version)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    _atomic_write(
+        _latest_path(gu_code),
+        json.dumps(info, ensure_ascii=False).encode("utf-8")
+    )
+
+    _cleanup_old_versions(gu_code)
+    return info
+
+
+def _cleanup_old_versions(gu_code):
+    """오래된 스냅샷 정리 (사용 중인 파일 삭제 실패는 무시)"""
+    versions = sorted(
+        name for name in os.listdir(_gu_dir(gu_code)) if name.endswith(".arrow")
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        # 삭제되는 버전을 참조 중이면 매핑 해제
+        cached = _opened_tables.get(str(gu_code))
+        if cached is not None and f"{cached[0]}.arrow" == name:
+            del _opened_tables[str(gu_code)]
+        try:
+            os.remove(os.path.join(_gu_dir(gu_code), name))
+        except OSError:
+            pass
+
+
+def _try_lock(fd):
+    """잠금 파일에 OS 잠금 시도 (프로세스가 종료되면 OS 가 자동으로 해제)"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def ingest_lock(gu_code, blocking=True, poll_interval=1.0):
+    """자치구별 수집 잠금 - 한 프로세스만 API 조회/위경도 조회를 수행
+
+    blocking=False 이면 잠금을 바로 얻지 못한 경우 기다리지 않고 False 를 전달
+    """
+    os.makedirs(_gu_dir(gu_code), exist_ok=True)
+    lock_path = os.path.join(_gu_dir(gu_code), "ingest.lock")
+
+    # 잠금 파일은 삭제하지 않고 계속 사용 (삭제/재생성 경합 방지)
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+    try:
+        while not _try_lock(fd):
+            if not blocking:
+                yield False
+                return
+            time.sleep(poll_interval)
+
+        try:
+            yield True
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def get_or_build(gu_code, gu_name, build_func, ttl=SNAPSHOT_TTL):
+    """최신 스냅샷을 반환하고, 만료되었거나 없으면 잠금을 잡은 프로세스만 build_func 로 생성
+
+    만료된 스냅샷이 있으면 다른 프로세스는 갱신을 기다리지 않고 기존 스냅샷을 사용
+    build_func 는 (DataFrame, error_msg) 를 반환해야 함
+    반환값: (Table, info, error_msg)
+    - 갱신에 실패했지만 기존 스냅샷이 있으면 Table 과 함께 error_msg 를 반환 (경고용)
+    """
+    info = latest_info(gu_code)
+    table = open_snapshot(gu_code, info["version"]) if info is not None else None
+    if table is not None and is_fresh(info, ttl):
+        return table, info, None
+
+    with ingest_lock(gu_code, blocking=table is None) as acquired:
+        if not acquired:
+            return table, info, None
+
+        # 잠금 대기 중 다른 프로세스가 게시했을 수 있으므로 다시 확인
+        fresh_table, fresh_info = load_latest(gu_code, ttl)
+        if fresh_table is not None:
+            return fresh_table, fresh_info, None
+
+        df, error_msg = build_func()
+        if not error_msg:
+            try:
+                info = publish_snapshot(gu_code, gu_name, df)
+            except Exception as e:
+                error_msg = f"스냅샷 저장 중 오류 발생: {str(e)}"
+        if error_msg:
+            # 갱신에 실패해도 기존 스냅샷이 있으면 그대로 사용
+            return table, (info if table is not None else None), error_msg
+
+    return open_snapshot(gu_code, info["version"]), info, None